@@ -7,86 +7,180 @@ Usage:
 """
 
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner.script_run_context import (
+    SCRIPT_RUN_CONTEXT_ATTR_NAME,
+)
+import numpy as np
 import pandas as pd
+import matplotlib
+
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
-
-
-@st.cache_data
-def load_data():
-    try:
-        # # Print current directory for debugging
-        # st.write("Current directory:", os.getcwd())
-
-        # # List files in the directory for debugging
-        # st.write("Files in directory:", os.listdir())
-
-        # Load data
-        # file_path = "./main_data.csv"
-        file_path = "data/main_data.csv"
-        df = pd.read_csv(file_path)
-        return df
-    except FileNotFoundError:
-        st.error("Failed to load data. File not found.")
-        return None
+from numba import njit
+
+# Define the order of the months
+MONTH_ORDER = [
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+]
+
+# Keep seasons and weather in the order they appear in the data, rather than
+# the alphabetical order a plain category dtype would give
+SEASON_ORDER = ["Winter", "Spring", "Summer", "Fall"]
+WEATHER_ORDER = ["Clear", "Misty", "Light_RainSnow", "Heavy_RainSnow"]
+
+# Resolve the chart palettes once instead of by name on every draw
+SET2 = sns.color_palette("Set2", n_colors=4)
+PASTEL = sns.color_palette("pastel", n_colors=4)
+RAINBOW = sns.color_palette("rainbow", n_colors=4)
+TAB10 = plt.get_cmap("tab10")
+
+# grouped_bars draws with plain ax.bar, so apply seaborn's bar desaturation here
+BAR_DEFAULT = sns.color_palette(n_colors=2, desat=0.75)
+BAR_SET2 = sns.color_palette(SET2, desat=0.75)
+BAR_PASTEL = sns.color_palette(PASTEL, desat=0.75)
+
+
+@st.cache_data(persist="disk")
+def load_data(file_path, mtime):
+    # 'mtime' is only part of the cache key, so an updated CSV is re-read.
+    # A missing file raises instead of returning, so no failure is persisted.
+    df = pd.read_csv(
+        file_path,
+        engine="pyarrow",
+        usecols=[
+            "date",
+            "year",
+            "month",
+            "season",
+            "weather",
+            "workingday",
+            "hour",
+            "temp",
+            "casual",
+            "registered",
+            "total_count",
+        ],
+        parse_dates=["date"],
+        dtype={
+            "hour": "int8",
+            "workingday": "category",
+            "season": pd.CategoricalDtype(SEASON_ORDER),
+            "weather": pd.CategoricalDtype(WEATHER_ORDER),
+            "year": "int16",
+            "casual": "int32",
+            "registered": "int32",
+            "total_count": "int32",
+        },
+    )
+    # Convert 'month' column to categorical with the specified order
+    df["month"] = pd.Categorical(df["month"], categories=MONTH_ORDER, ordered=True)
+    return df
 
 
 def monthly_count(data):
-    # Define the order of the months
-    month_order = [
-        "Jan",
-        "Feb",
-        "Mar",
-        "Apr",
-        "May",
-        "Jun",
-        "Jul",
-        "Aug",
-        "Sep",
-        "Oct",
-        "Nov",
-        "Dec",
-    ]
-
-    # Convert 'month' column to categorical with the specified order
-    data["month"] = pd.Categorical(data["month"], categories=month_order, ordered=True)
-
     # Group by 'month' and aggregate the total counts
-    return data.groupby("month").agg({"total_count": "sum"}).reset_index()
+    return (
+        data.groupby("month", observed=True).agg({"total_count": "sum"}).reset_index()
+    )
 
 
 def yearly_count(data):
-    return data.groupby(["year", "month"]).agg({"total_count": "sum"}).reset_index()
+    # Fold (year, month) into one integer key so a bincount does the grouping
+    years = data["year"].to_numpy(np.int64)
+    first_year = years.min()
+    keys = (years - first_year) * 12 + data["month"].cat.codes.to_numpy(np.int64)
+    sums = np.bincount(keys, weights=data["total_count"].to_numpy(np.float64))
+    observed = np.flatnonzero(np.bincount(keys))
+    return pd.DataFrame(
+        {
+            "year": first_year + observed // 12,
+            "month": pd.Categorical.from_codes(
+                observed % 12, dtype=data["month"].dtype
+            ),
+            "total_count": sums[observed].astype(np.int64),
+        }
+    )
 
 
 def monthly_weekday_count(data):
-    return (
-        data.groupby(["month", "workingday"])
-        .agg({"total_count": ["mean", "sum"]})
-        .reset_index()
+    # Sum once per group and derive the mean from the group sizes
+    grouped = data.groupby(["month", "workingday"], observed=True, sort=False)
+    sums = grouped["total_count"].sum()
+    sizes = grouped.size()
+    return pd.DataFrame(
+        {
+            "month": sums.index.get_level_values(0),
+            "workingday": sums.index.get_level_values(1),
+            "sum": sums.values,
+            "mean": sums.values / sizes.values,
+        }
     )
 
 
-def hourly_count(data):
-    return data.groupby("hour").agg({"total_count": "sum"}).reset_index()
-
+@njit(cache=True)
+def hour_sum(hours, counts):
+    # Sum counts into one bucket per hour of the day
+    out = np.zeros(24, dtype=np.int64)
+    for i in range(hours.size):
+        out[hours[i]] += counts[i]
+    return out
 
-def best_hour_select(data):
-    return data.groupby("hour").agg({"total_count": "sum"}).idxmax()["total_count"]
 
-
-def worst_hour_select(data):
-    return data.groupby("hour").agg({"total_count": "sum"}).idxmin()["total_count"]
+def hourly_count(data):
+    hours = data["hour"].to_numpy(np.int8)
+    counts = data["total_count"].to_numpy(np.int64)
+    # hour_sum does no bounds checking, so reject hours it would write past
+    if hours.size and (hours.min() < 0 or hours.max() > 23):
+        raise ValueError("'hour' values must be between 0 and 23")
+    return pd.DataFrame({"hour": np.arange(24), "total_count": hour_sum(hours, counts)})
 
 
 def season_year_data(data):
-    return data.groupby(["season", "year"]).agg({"total_count": "sum"}).reset_index()
+    # Fold (season, year) into one integer key so a bincount does the grouping
+    years = data["year"].to_numpy(np.int64)
+    first_year = years.min()
+    n_years = years.max() - first_year + 1
+    keys = data["season"].cat.codes.to_numpy(np.int64) * n_years + (years - first_year)
+    sums = np.bincount(keys, weights=data["total_count"].to_numpy(np.float64))
+    observed = np.flatnonzero(np.bincount(keys))
+    return pd.DataFrame(
+        {
+            "season": pd.Categorical.from_codes(
+                observed // n_years, dtype=data["season"].dtype
+            ),
+            "year": first_year + observed % n_years,
+            "total_count": sums[observed].astype(np.int64),
+        }
+    )
 
 
-def seasonal(data):
+@st.cache_data
+def seasonal(data, start=None, end=None):
+    # Filter to the plotted date range before grouping, so rows outside it
+    # are never aggregated
+    if start is not None:
+        data = data[data["date"] >= start]
+    if end is not None:
+        data = data[data["date"] <= end]
     return (
-        data.groupby(["date", "season"])
+        data.groupby(["date", "season"], observed=True, sort=False)
         .agg({"temp": "mean", "total_count": "sum"})
         .reset_index()
     )
@@ -97,17 +191,465 @@ def dailydata(data):
 
 
 def weekly_trend(data):
-    # Ensure 'date' column is of type datetime
-    week = data.copy()
-    week["date"] = pd.to_datetime(week["date"])
+    # Bucket each day into its week ending on Sunday, like resample("W")
+    days = data["date"].values.astype("datetime64[D]")
+    week_end = days + (6 - (days.view("int64") + 3) % 7)
+    edges = np.flatnonzero(np.diff(week_end.view("int64"), prepend=-1))
+
+    # Weekly mean = sum over each run of days / number of days in the run
+    sums = np.add.reduceat(data["total_count"].values, edges)
+    counts = np.diff(np.append(edges, len(days)))
 
-    # Set 'date' column as the index
-    week.set_index("date", inplace=True)
+    return pd.DataFrame({"date": week_end[edges], "total_count": sums / counts})
+
+
+@st.cache_data
+def compute_aggregates(data):
+    hourly_data = hourly_count(data)
+    # Best and worst hour are picked straight from the hourly totals
+    hourly_totals = hourly_data["total_count"].values
+    best_hour = int(hourly_data["hour"].iloc[hourly_totals.argmax()])
+    worst_hour = int(hourly_data["hour"].iloc[hourly_totals.argmin()])
+
+    daily_data = dailydata(data)
+
+    return {
+        "monthly": monthly_count(data),
+        "yearly": yearly_count(data),
+        "monthly_weekday": monthly_weekday_count(data),
+        "hourly": hourly_data,
+        "best_hour": best_hour,
+        "worst_hour": worst_hour,
+        "season_year": season_year_data(data),
+        "daily": daily_data,
+        "weekly": weekly_trend(daily_data),
+    }
+
+
+# Figures are keyed on the content of the frames they are drawn from, including
+# row order and column names
+FIGURE_HASH_FUNCS = {
+    pd.DataFrame: lambda d: (
+        tuple(d.columns),
+        pd.util.hash_pandas_object(d, index=True).to_numpy().tobytes(),
+    )
+}
+
+
+def annotate_bars(ax):
+    # Menambahkan label angka di atas setiap bar
+    for p in ax.patches:
+        ax.annotate(
+            format(p.get_height(), ".0f"),
+            (p.get_x() + p.get_width() / 2.0, p.get_height()),
+            ha="center",
+            va="center",
+            xytext=(0, 5),
+            textcoords="offset points",
+        )
+
+
+def grouped_bars(ax, wide, colors, legend_title=None):
+    # One group of bars per row of 'wide', one bar per column within a group
+    x = np.arange(len(wide.index))
+    n_hue = len(wide.columns)
+    width = 0.8 / n_hue
+    for i, hue in enumerate(wide.columns):
+        offset = (i - (n_hue - 1) / 2) * width
+        ax.bar(x + offset, wide[hue].to_numpy(), width, color=colors[i], label=hue)
+    ax.set_xticks(x, wide.index.astype(str))
+    # Legend title defaults to the name of the hue axis
+    ax.legend(title=legend_title or wide.columns.name)
+
+
+def scatter_by_hue(ax, data, x, y, hue):
+    # A single rasterized scatter colored by category code, instead of one
+    # vector artist per point
+    categories = data[hue].cat.categories
+    ax.scatter(
+        data[x].to_numpy(),
+        data[y].to_numpy(),
+        c=data[hue].cat.codes.to_numpy(),
+        cmap=TAB10,
+        vmin=0,
+        vmax=TAB10.N - 1,
+        s=6,
+        rasterized=True,
+    )
+    ax.legend(
+        handles=[
+            plt.Line2D([], [], marker="o", linestyle="", color=TAB10(i))
+            for i in range(len(categories))
+        ],
+        labels=list(categories),
+        title=hue,
+    )
 
-    # Resample the data to weekly intervals and calculate the mean
-    weekly_average = week.resample("W").mean()
 
-    return weekly_average
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_monthly_line(monthly_counts):
+    fig = Figure(figsize=(8, 5), facecolor="w")
+    ax = fig.subplots()
+    sns.lineplot(
+        x="month",
+        y="total_count",
+        data=monthly_counts,
+        color="skyblue",
+        marker="o",
+        sort=False,
+        ax=ax,
+    )
+    ax.set_title("Monthly Bike sharing User", color="w")
+    ax.set_xlabel("Month", color="w")
+    ax.set_ylabel("Total Rental Counts", color="w")
+    ax.set_xticks(range(12), MONTH_ORDER)
+    ax.grid(True)
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_monthly_bar(monthly_counts):
+    # Sorting the monthly counts
+    order = np.argsort(monthly_counts["total_count"].to_numpy())
+    sorted_months = monthly_counts["month"].to_numpy()[order]
+    sorted_counts = monthly_counts["total_count"].to_numpy()[order]
+    # Assigning colors to lowest (first) and highest (last) months
+    colors = np.full(len(order), "gray", dtype=object)
+    colors[0] = "red"
+    colors[-1] = "green"
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    ax.barh(sorted_months, sorted_counts, color=colors)
+    ax.set_title("Monthly Performance of Bike Sharing Users (2011-2012)")
+    ax.set_xlabel("Total Count")
+    ax.set_ylabel("Month")
+    ax.grid(axis="x")
+    ax.legend(
+        handles=[
+            plt.Rectangle((0, 0), 1, 1, color="red", ec="k"),
+            plt.Rectangle((0, 0), 1, 1, color="green", ec="k"),
+            plt.Rectangle((0, 0), 1, 1, color="gray", ec="k"),
+        ],
+        labels=[
+            "Lowest Performing Month",
+            "Highest Performing Month",
+            "Other Months",
+        ],
+        loc="lower right",
+    )
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_yearly_line(yearly_counts):
+    fig = Figure(figsize=(8, 4))
+    ax = fig.subplots()
+    ax.plot(yearly_counts["total_count"], marker="o", linestyle="-")
+    # Customize the plot
+    ax.set_title("Monthly Bike Sharing User (2011-2012)")
+    ax.set_xlabel("Months")
+    ax.set_ylabel("Total Counts")
+    ax.set_xticks(
+        range(len(yearly_counts)),
+        (
+            yearly_counts["year"].astype(str)
+            + "-"
+            + yearly_counts["month"].astype(str)
+        ).to_numpy(),
+        rotation=45,
+    )
+    ax.grid(True)
+    fig.tight_layout()
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_workday_bar_mean(monthly_weekday_counts):
+    wide = monthly_weekday_counts.pivot(
+        index="month", columns="workingday", values="mean"
+    )
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    grouped_bars(ax, wide, BAR_DEFAULT)
+    ax.set_title("Average Rental Counts per Month: Workingday vs Weekend (Using Mean)")
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Average Rental Counts")
+    ax.tick_params(axis="x", labelrotation=45)
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_workday_bar_sum(monthly_weekday_counts):
+    wide = monthly_weekday_counts.pivot(
+        index="month", columns="workingday", values="sum"
+    )
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    grouped_bars(ax, wide, BAR_DEFAULT)
+    ax.set_title("Total Rental Counts per Month: Workingday vs Weekend (Using Sum)")
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Total Rental Counts")
+    ax.tick_params(axis="x", labelrotation=45)
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_hourly_bar(hourly_data, best_hour, worst_hour):
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.bar(hourly_data["hour"], hourly_data["total_count"], color="skyblue")
+    ax.set_xlabel("Hour")
+    ax.set_ylabel("Total Count")
+    ax.set_title("Total Bike Share Usage by Hour")
+    ax.set_xticks(hourly_data["hour"])
+    ax.axvline(x=best_hour, color="green", linestyle="--", label="Best Hour")
+    ax.axvline(x=worst_hour, color="red", linestyle="--", label="Worst Hour")
+    ax.legend()
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_season_year_bar(season_year):
+    wide = season_year.pivot(index="season", columns="year", values="total_count")
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    grouped_bars(ax, wide, BAR_SET2, legend_title="Year")
+    ax.set_title("Total Count of Bikes by Season in 2011 and 2012")
+    ax.set_xlabel("Season")
+    ax.set_ylabel("Total Count of Bikes")
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_temp_hist(data):
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    sns.histplot(data["temp"], bins=20, kde=True, color="blue", ax=ax)
+    ax.set_title("Distribution of Temperature")
+    ax.set_xlabel("Temperature")
+    ax.set_ylabel("Frequency")
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_season_bar(data):
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    sns.barplot(
+        x="season", y="total_count", data=data, palette=SET2, errorbar=None, ax=ax
+    )
+    ax.set_title("Box Plot of Total Count by Season")
+    ax.set_xlabel("Season")
+    ax.set_ylabel("Total Count")
+    annotate_bars(ax)
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_weather_count(data):
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    sns.countplot(x="weather", data=data, palette=RAINBOW, ax=ax)
+    ax.set_title("Count of Weather Categories")
+    ax.set_xlabel("Weather")
+    ax.set_ylabel("Count")
+    annotate_bars(ax)
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_weather_temp_box(data):
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    sns.boxplot(x="weather", y="temp", data=data, ax=ax)
+    ax.set_title("Persebaran Suhu Berdasarkan Cuaca")
+    ax.set_xlabel("Weather")
+    ax.set_ylabel("Temperature (Celsius)")
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=6, show_spinner=False
+)
+def make_temp_scatter(data, y, title, ylabel, title_color="black"):
+    # Scatter plot untuk melihat hubungan temperature dan pengguna
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    scatter_by_hue(ax, data, "temp", y, "weather")
+    ax.set_title(title, color=title_color)
+    ax.set_xlabel("Temperature")
+    ax.set_ylabel(ylabel)
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_season_weather_count(data):
+    counts = data.groupby(["season", "weather"], observed=False).size().unstack()
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    grouped_bars(ax, counts, BAR_PASTEL)
+    annotate_bars(ax)
+    ax.set_title("Count of Weather Categories by Season")
+    ax.set_xlabel("Season")
+    ax.set_ylabel("Count")
+    return fig
+
+
+@st.cache_resource(hash_funcs=FIGURE_HASH_FUNCS, max_entries=2)
+def make_season_temp_scatter(seasonal_data):
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    scatter_by_hue(ax, seasonal_data, "temp", "total_count", "season")
+    ax.set_xlabel("Temperature (deg C)")
+    ax.set_ylabel("Total Rides")
+    ax.set_title("Clusters of bikeshare rides by season and temperature (2011-2012)")
+    fig.tight_layout()
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_daily_line(daily_data):
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    sns.lineplot(
+        x="date", y="total_count", data=daily_data, color="skyblue", sort=False, ax=ax
+    )
+    ax.set_title("Daily Bike Sharing User")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Total Rental Counts")
+    # Pick 10 dates from the entire range of dates
+    date_range = pd.date_range(
+        start=daily_data["date"].min(), end=daily_data["date"].max(), freq="D"
+    )
+    tick_indices = range(0, len(date_range), len(date_range) // 10)
+    ax.set_xticks(
+        date_range[tick_indices],
+        date_range[tick_indices].strftime("%Y-%m-%d"),
+        rotation=30,
+    )
+    ax.grid(True)
+    fig.tight_layout()
+    return fig
+
+
+@st.cache_resource(
+    hash_funcs=FIGURE_HASH_FUNCS, max_entries=2, show_spinner=False
+)
+def make_weekly_trend(weekly_average):
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    sns.lineplot(
+        x="date",
+        y="total_count",
+        data=weekly_average,
+        color="blue",
+        marker="o",
+        sort=False,
+        ax=ax,
+    )
+    ax.set_title("Weekly Trend of Bike Rentals")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Total Count")
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.grid(True)
+    return fig
+
+
+@st.cache_resource
+def get_chart_executor():
+    # One pool shared by every rerun and session, so warm reruns that only
+    # look up cached figures don't start new threads
+    return ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+def run_in_context(ctx, fn, *args):
+    # Pool threads outlive a single run, so attach the caller's run context
+    # for the duration of each task only. Builders run here with
+    # show_spinner=False, since spinners from many threads would race on the
+    # page.
+    thread = threading.current_thread()
+    add_script_run_ctx(thread, ctx)
+    try:
+        return fn(*args)
+    finally:
+        # add_script_run_ctx(thread, None) would keep the current context, so
+        # clear the attribute directly
+        setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+
+
+@st.fragment
+def render_tab_count(figs):
+    charT1, charT2 = st.columns(2)
+    charT3, charT4 = st.columns(2)
+    with charT1:
+        st.pyplot(figs["temp_hist"])
+
+    with charT2:
+        st.pyplot(figs["season_bar"])
+
+    with charT3:
+        st.pyplot(figs["weather_count"])
+
+    with charT4:
+        st.pyplot(figs["weather_temp_box"])
+
+
+@st.fragment
+def render_tab_temperature(figs):
+    total_user, casual, registered = st.columns(3)
+    with total_user:
+        st.pyplot(figs["total_temp_scatter"])
+
+    with casual:
+        st.pyplot(figs["casual_temp_scatter"])
+
+    with registered:
+        st.pyplot(figs["registered_temp_scatter"])
+
+
+@st.fragment
+def render_tab_season(data, figs):
+    season2, season3 = st.columns(2)
+    with season3:
+        st.pyplot(figs["season_weather_count"])
+
+    with season2:
+        seasonal_data = seasonal(data)
+        st.pyplot(make_season_temp_scatter(seasonal_data))
+
+
+@st.fragment
+def render_tab_trend(figs):
+    st.subheader("Daily and Weekly Trend of Bike Sharing Rental Counts")
+
+    st.pyplot(figs["daily_line"])
+    st.pyplot(figs["weekly_trend"])
 
 
 # Set the page configuration
@@ -118,7 +660,12 @@ st.set_page_config(
 )
 
 # Load the cleaned data
-main_data = load_data()
+file_path = "data/main_data.csv"
+try:
+    main_data = load_data(file_path, os.path.getmtime(file_path))
+except FileNotFoundError:
+    st.error("Failed to load data. File not found.")
+    st.stop()
 main_data.head()
 
 # Center-align the title
@@ -129,22 +676,69 @@ st.markdown(
 st.markdown("<hr>", unsafe_allow_html=True)
 
 
-# call functions
-monthly_counts = monthly_count(main_data)
-yearly_counts = yearly_count(main_data)
-monthly_weekday_counts = monthly_weekday_count(main_data)
-hourly_data = hourly_count(main_data)
-best_hour = best_hour_select(main_data)
-worst_hour = worst_hour_select(main_data)
-season_year = season_year_data(main_data)
-seasonal_data = seasonal(main_data)
-daily_data = dailydata(main_data)
-weekly_average = weekly_trend(daily_data)
+# Compute every aggregate in one cached pass
+aggs = compute_aggregates(main_data)
+monthly_counts = aggs["monthly"]
+yearly_counts = aggs["yearly"]
+monthly_weekday_counts = aggs["monthly_weekday"]
+hourly_data = aggs["hourly"]
+best_hour = aggs["best_hour"]
+worst_hour = aggs["worst_hour"]
+season_year = aggs["season_year"]
+daily_data = aggs["daily"]
+weekly_average = aggs["weekly"]
 
 # Total Bike User Section
-total_users = main_data["total_count"].sum()
-casual_users = main_data["casual"].sum()
-registered_users = main_data["registered"].sum()
+total_users, casual_users, registered_users = (
+    main_data[["total_count", "casual", "registered"]].to_numpy().sum(axis=0)
+)
+
+# Every figure depends only on its own inputs, so build them side by side
+chart_specs = {
+    "monthly_line": (make_monthly_line, monthly_counts),
+    "monthly_bar": (make_monthly_bar, monthly_counts),
+    "yearly_line": (make_yearly_line, yearly_counts),
+    "workday_bar_mean": (make_workday_bar_mean, monthly_weekday_counts),
+    "workday_bar_sum": (make_workday_bar_sum, monthly_weekday_counts),
+    "hourly_bar": (make_hourly_bar, hourly_data, best_hour, worst_hour),
+    "season_year_bar": (make_season_year_bar, season_year),
+    "temp_hist": (make_temp_hist, main_data),
+    "season_bar": (make_season_bar, main_data),
+    "weather_count": (make_weather_count, main_data),
+    "weather_temp_box": (make_weather_temp_box, main_data),
+    "total_temp_scatter": (
+        make_temp_scatter,
+        main_data,
+        "total_count",
+        "Total Bike Sharing User in Different Temperature",
+        "Total user",
+        "w",
+    ),
+    "casual_temp_scatter": (
+        make_temp_scatter,
+        main_data,
+        "casual",
+        "Casual Bike Sharing User in Different Temperature",
+        "Casual",
+    ),
+    "registered_temp_scatter": (
+        make_temp_scatter,
+        main_data,
+        "casual",
+        "Registered pengguna register pada berbagai suhu",
+        "Registered",
+    ),
+    "season_weather_count": (make_season_weather_count, main_data),
+    "daily_line": (make_daily_line, daily_data),
+    "weekly_trend": (make_weekly_trend, weekly_average),
+}
+run_ctx = get_script_run_ctx()
+executor = get_chart_executor()
+futures = {
+    name: executor.submit(run_in_context, run_ctx, fn, *args)
+    for name, (fn, *args) in chart_specs.items()
+}
+figs = {name: future.result() for name, future in futures.items()}
 
 
 col1, col2, col3 = st.columns(3)
@@ -203,80 +797,10 @@ with st.container():
     chart1, chart2 = st.columns(2)
 
     with chart1:
-        chart1 = plt.figure(figsize=(8, 5), facecolor="w")
-        sns.lineplot(
-            x="month",
-            y="total_count",
-            data=monthly_counts,
-            color="skyblue",
-            marker="o",
-            sort=False,
-        )
-        plt.title("Monthly Bike sharing User", color="w")
-        plt.xlabel("Month", color="w")
-        plt.ylabel("Total Rental Counts", color="w")
-        plt.xticks(
-            range(12),
-            [
-                "Jan",
-                "Feb",
-                "Mar",
-                "Apr",
-                "May",
-                "Jun",
-                "Jul",
-                "Aug",
-                "Sep",
-                "Oct",
-                "Nov",
-                "Dec",
-            ],
-        )
-        plt.grid(True)
-        st.pyplot(chart1)
+        st.pyplot(figs["monthly_line"])
 
     with chart2:
-        # Sorting the monthly counts
-        sorted_monthly_counts = monthly_counts.sort_values(
-            by="total_count", ascending=True
-        )
-        # Assigning colors to highest and lowest months
-        colors = [
-            (
-                "red"
-                if x in sorted_monthly_counts.head(1)["month"].values
-                else (
-                    "green"
-                    if x in sorted_monthly_counts.tail(1)["month"].values
-                    else "gray"
-                )
-            )
-            for x in sorted_monthly_counts["month"]
-        ]
-        chart2 = plt.figure(figsize=(8, 5))
-        plt.barh(
-            sorted_monthly_counts["month"],
-            sorted_monthly_counts["total_count"],
-            color=colors,
-        )
-        plt.title("Monthly Performance of Bike Sharing Users (2011-2012)")
-        plt.xlabel("Total Count")
-        plt.ylabel("Month")
-        plt.grid(axis="x")
-        plt.legend(
-            handles=[
-                plt.Rectangle((0, 0), 1, 1, color="red", ec="k"),
-                plt.Rectangle((0, 0), 1, 1, color="green", ec="k"),
-                plt.Rectangle((0, 0), 1, 1, color="gray", ec="k"),
-            ],
-            labels=[
-                "Lowest Performing Month",
-                "Highest Performing Month",
-                "Other Months",
-            ],
-            loc="lower right",
-        )
-        st.pyplot(chart2)
+        st.pyplot(figs["monthly_bar"])
 
     st.write(
         """
@@ -293,24 +817,7 @@ with st.container():
 with st.container():
     st.subheader("Monthly Bike Sharing User from Jan 2011 to Des 2012")
     st.markdown("<hr>", unsafe_allow_html=True)
-    chart3 = plt.figure(figsize=(8, 4))
-    plt.plot(yearly_counts["total_count"], marker="o", linestyle="-")
-    # Customize the plot
-    plt.title("Monthly Bike Sharing User (2011-2012)")
-    plt.xlabel("Months")
-    plt.ylabel("Total Counts")
-    plt.xticks(
-        ticks=range(len(yearly_counts)),
-        labels=[
-            f"{year}-{month}"
-            for year, month in zip(yearly_counts["year"], yearly_counts["month"])
-        ],
-        rotation=45,
-    )
-    plt.grid(True)
-    # Show plot
-    plt.tight_layout()
-    st.pyplot(chart3)
+    st.pyplot(figs["yearly_line"])
 
     st.write(
         """
@@ -331,34 +838,10 @@ with st.container():
     st.markdown("<hr>", unsafe_allow_html=True)
     work1, work2 = st.columns(2)
     with work1:
-        plt.figure(figsize=(12, 6))
-        sns.barplot(
-            x="month",
-            y=("total_count", "mean"),
-            hue="workingday",
-            data=monthly_weekday_counts,
-        )
-        plt.title("Average Rental Counts per Month: Workingday vs Weekend (Using Mean)")
-        plt.xlabel("Month")
-        plt.ylabel("Average Rental Counts")
-        plt.xticks(rotation=45)
-        avg_counts_mean_fig = plt.gcf()
-        st.pyplot(avg_counts_mean_fig)
+        st.pyplot(figs["workday_bar_mean"])
 
     with work2:
-        plt.figure(figsize=(12, 6))
-        sns.barplot(
-            x="month",
-            y=("total_count", "sum"),
-            hue="workingday",
-            data=monthly_weekday_counts,
-        )
-        plt.title("Total Rental Counts per Month: Workingday vs Weekend (Using Sum)")
-        plt.xlabel("Month")
-        plt.ylabel("Total Rental Counts")
-        plt.xticks(rotation=45)
-        total_counts_sum_fig = plt.gcf()
-        st.pyplot(total_counts_sum_fig)
+        st.pyplot(figs["workday_bar_sum"])
 
     st.write(
         """
@@ -377,19 +860,7 @@ with st.container():
     with hour1:
         st.subheader("Hourly Bike Sharing User")
         st.markdown("<hr>", unsafe_allow_html=True)
-        hourly_fig = plt.figure(figsize=(10, 6))
-        plt.bar(hourly_data["hour"], hourly_data["total_count"], color="skyblue")
-        plt.xlabel("Hour")
-        plt.ylabel("Total Count")
-        plt.title("Total Bike Share Usage by Hour")
-        plt.xticks(hourly_data["hour"])
-        plt.axvline(x=best_hour, color="green", linestyle="--", label="Best Hour")
-        plt.axvline(x=worst_hour, color="red", linestyle="--", label="Worst Hour")
-        plt.legend()
-        plt.close(
-            hourly_fig
-        )  # Close the figure to prevent it from being displayed prematurely
-        st.pyplot(hourly_fig)
+        st.pyplot(figs["hourly_bar"])
 
         st.write(
             """
@@ -409,16 +880,7 @@ with st.container():
     with season1:
         st.subheader("Bike Sharing User by Season")
         st.markdown("<hr>", unsafe_allow_html=True)
-        season1 = plt.figure(figsize=(10, 6))
-        sns.barplot(
-            x="season", y="total_count", hue="year", data=season_year, palette="Set2"
-        )
-        plt.title("Total Count of Bikes by Season in 2011 and 2012")
-        plt.xlabel("Season")
-        plt.ylabel("Total Count of Bikes")
-        plt.legend(title="Year")
-        plt.show()
-        st.pyplot(season1)
+        st.pyplot(figs["season_year_bar"])
 
         st.write(
             """
@@ -442,176 +904,18 @@ tab1, tab2, tab3, tab4 = st.tabs(
     ["Count", "Temperature", "Season", "daily/weekly trent"]
 )
 
+# Each tab is a fragment, so interacting with one only reruns that tab
 with tab1:
-    charT1, charT2 = st.columns(2)
-    charT3, charT4 = st.columns(2)
-    with charT1:
-        charT1 = plt.figure(figsize=(8, 6))
-        sns.histplot(main_data["temp"], bins=20, kde=True, color="blue")
-        plt.title("Distribution of Temperature")
-        plt.xlabel("Temperature")
-        plt.ylabel("Frequency")
-        plt.show()
-        st.pyplot(charT1)
-
-    with charT2:
-        charT2 = plt.figure(figsize=(8, 6))
-        ax = sns.barplot(
-            x="season", y="total_count", data=main_data, palette="Set2", errorbar=None
-        )
-        plt.title("Box Plot of Total Count by Season")
-        plt.xlabel("Season")
-        plt.ylabel("Total Count")
-        # Menambahkan label angka di atas setiap bar
-        for p in ax.patches:
-            ax.annotate(
-                format(p.get_height(), ".0f"),
-                (p.get_x() + p.get_width() / 2.0, p.get_height()),
-                ha="center",
-                va="center",
-                xytext=(0, 5),
-                textcoords="offset points",
-            )
-        plt.show()
-        st.pyplot(charT2)
-
-    with charT3:
-        charT3 = plt.figure(figsize=(8, 6))
-        ax = sns.countplot(x="weather", data=main_data, palette="rainbow")
-        plt.title("Count of Weather Categories")
-        plt.xlabel("Weather")
-        plt.ylabel("Count")
-
-        # Menambahkan label angka di atas setiap bar
-        for p in ax.patches:
-            ax.annotate(
-                format(p.get_height(), ".0f"),
-                (p.get_x() + p.get_width() / 2.0, p.get_height()),
-                ha="center",
-                va="center",
-                xytext=(0, 5),
-                textcoords="offset points",
-            )
-
-        plt.show()
-        st.pyplot(charT3)
-
-    with charT4:
-        charT4 = plt.figure(figsize=(8, 6))
-        sns.boxplot(x="weather", y="temp", data=main_data)
-        plt.title("Persebaran Suhu Berdasarkan Cuaca")
-        plt.xlabel("Weather")
-        plt.ylabel("Temperature (Celsius)")
-        plt.show()
-        st.pyplot(charT4)
+    render_tab_count(figs)
 
 with tab2:
-    total_user, casual, registered = st.columns(3)
-    with total_user:
-        # Scatter plot untuk melihat hubungan temoerature dan total pengguna penguna
-        total_user = plt.figure(figsize=(8, 6))
-        sns.scatterplot(x="temp", y="total_count", data=main_data, hue="weather")
-        plt.title("Total Bike Sharing User in Different Temperature", color="w")
-        plt.xlabel("Temperature")
-        plt.ylabel("Total user")
-        plt.tick_params(axis="x")
-        plt.tick_params(axis="y")
-        plt.show()
-        st.pyplot(total_user)
-
-    with casual:
-        # Scatter plot untuk melihat hubungan temoerature dan penguna casual
-        casual = plt.figure(figsize=(8, 6))
-        sns.scatterplot(x="temp", y="casual", data=main_data, hue="weather")
-        plt.title("Casual Bike Sharing User in Different Temperature")
-        plt.xlabel("Temperature")
-        plt.ylabel("Casual")
-        plt.show()
-        st.pyplot(casual)
-
-    with registered:
-        # Scatter plot untuk melihat hubungan temoerature dan penguna registered
-        registered = plt.figure(figsize=(8, 6))
-        sns.scatterplot(x="temp", y="casual", data=main_data, hue="weather")
-        plt.title("Registered pengguna register pada berbagai suhu")
-        plt.xlabel("Temperature")
-        plt.ylabel("Registered")
-        plt.show()
-        st.pyplot(registered)
+    render_tab_temperature(figs)
 
 with tab3:
-    season2, season3 = st.columns(2)
-    with season3:
-        season3 = plt.figure(figsize=(10, 6))
-        ax = sns.countplot(x="season", hue="weather", data=main_data, palette="pastel")
-
-        # Menambahkan label angka di atas setiap bar
-        for p in ax.patches:
-            ax.annotate(
-                format(p.get_height(), ".0f"),
-                (p.get_x() + p.get_width() / 2.0, p.get_height()),
-                ha="center",
-                va="center",
-                xytext=(0, 5),
-                textcoords="offset points",
-            )
-
-        plt.title("Count of Weather Categories by Season")
-        plt.xlabel("Season")
-        plt.ylabel("Count")
-        plt.show()
-        st.pyplot(season3)
-
-    with season2:
-        season2 = plt.figure(figsize=(10, 6))
-        sns.scatterplot(x="temp", y="total_count", data=seasonal_data, hue="season")
-        plt.xlabel("Temperature (deg C)")
-        plt.ylabel("Total Rides")
-        plt.title("Clusters of bikeshare rides by season and temperature (2011-2012)")
-        plt.tight_layout()
-        plt.show()
-        st.pyplot(season2)
-
+    render_tab_season(main_data, figs)
 
 with tab4:
-    st.subheader("Daily and Weekly Trend of Bike Sharing Rental Counts")
-
-    daily = plt.figure(figsize=(12, 6))
-    sns.lineplot(
-        x="date", y="total_count", data=daily_data, color="skyblue", sort=False
-    )
-    plt.title("Daily Bike Sharing User")
-    plt.xlabel("Date")
-    plt.ylabel("Total Rental Counts")
-    plt.xticks(rotation=30)
-    # Pick 10 dates from the entire range of dates
-    date_range = pd.date_range(
-        start=daily_data["date"].min(), end=daily_data["date"].max(), freq="D"
-    )
-    tick_indices = range(0, len(date_range), len(date_range) // 10)
-    plt.xticks(ticks=tick_indices, labels=date_range[tick_indices].strftime("%Y-%m-%d"))
-
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
-    st.pyplot(daily)
-
-    weekly = plt.figure(figsize=(12, 6))
-    sns.lineplot(
-        x="date",
-        y="total_count",
-        data=weekly_average,
-        color="blue",
-        marker="o",
-        sort=False,
-    )
-    plt.title("Weekly Trend of Bike Rentals")
-    plt.xlabel("Date")
-    plt.ylabel("Total Count")
-    plt.xticks(rotation=45)
-    plt.grid(True)
-    plt.show()
-    st.pyplot(weekly)
+    render_tab_trend(figs)
 
 
 st.caption("Copyright (c) akhmad jundan hidayatulloh 2024")